@@ -1,15 +1,15 @@
+import hmac
 from typing import Optional
-from fastapi import HTTPException, Security, Request
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import HTTPException, Request
 
+from app.config import settings
 
-security = HTTPBearer(auto_error=False)
 
+# Encoded once for constant-time comparison
+_api_key_bytes = settings.api_key.encode('utf-8')
 
-async def verify_api_key(
-    request: Request,
-    credentials: Optional[HTTPAuthorizationCredentials] = Security(security)
-) -> bool:
+
+async def verify_api_key(request: Request) -> bool:
     """
     Verify API key from Authorization header
     
@@ -17,29 +17,16 @@ async def verify_api_key(
     - Bearer token: Authorization: Bearer sk-xxx
     - Direct API key: Authorization: sk-xxx
     """
-    # Import here to avoid circular import
-    from app.main import settings
-    
     if not settings.api_key:
         raise HTTPException(
             status_code=500,
             detail="API key not configured on server"
         )
     
-    # Try to get token from HTTPBearer credentials
-    token = None
-    if credentials:
-        token = credentials.credentials
-    
-    # If not found, try to get from Authorization header directly
-    if not token:
-        auth_header = request.headers.get("Authorization", "")
-        if auth_header:
-            # Remove 'Bearer ' prefix if present
-            if auth_header.startswith('Bearer '):
-                token = auth_header[7:]
-            else:
-                token = auth_header
+    # Parse Authorization header once, removing 'Bearer ' prefix if present
+    token = request.headers.get("authorization")
+    if token and token[:7].lower() == "bearer ":
+        token = token[7:]
     
     if not token:
         raise HTTPException(
@@ -47,7 +34,7 @@ async def verify_api_key(
             detail="Missing API key. Please provide Authorization header with Bearer token."
         )
     
-    if token != settings.api_key:
+    if not hmac.compare_digest(token.encode('utf-8'), _api_key_bytes):
         raise HTTPException(
             status_code=401,
             detail="Invalid API key"
@@ -58,6 +45,5 @@ async def verify_api_key(
 
 def get_api_key_optional() -> Optional[str]:
     """Get API key if set, otherwise return None"""
-    from app.main import settings
     return settings.api_key if settings.api_key else None
 
@@ -0,0 +1,29 @@
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """Application settings"""
+    # Gonka API settings
+    gonka_private_key: str = ""
+    gonka_address: str = ""
+    gonka_endpoint: str = ""
+    gonka_provider_address: str = ""
+    
+    # API Key for external access
+    api_key: str = ""
+    
+    # Server settings
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1  # Worker processes for `python -m app.main`
+    
+    # Logging settings (DEBUG also logs full request bodies)
+    log_level: str = "INFO"
+    log_pretty_json: bool = False  # Indent logged request bodies (development only)
+    
+    class Config:
+        env_file = ".env"
+        case_sensitive = False
+
+
+settings = Settings()
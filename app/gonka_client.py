@@ -1,15 +1,37 @@
-import json
+import asyncio
 import time
 import hashlib
 import base64
 import logging
 from typing import Optional, Tuple
-from ecdsa import SigningKey, SECP256k1
 import httpx
+import orjson
+
+try:
+    import coincurve
+except ImportError:  # Fall back to pure-Python ECDSA if libsecp256k1 bindings are unavailable
+    coincurve = None
+    from ecdsa import SigningKey, SECP256k1
 
 
 logger = logging.getLogger(__name__)
 
+# Serialized empty payload (GET requests still sign a JSON body)
+_EMPTY_JSON = b'{}'
+
+# Payloads larger than this are signed in a worker thread to keep the event loop free
+_SIGN_IN_EXECUTOR_THRESHOLD = 4096
+
+
+def format_body(raw: bytes, pretty: bool) -> str:
+    """Format a JSON request body for debug logging (compact unless pretty is set)"""
+    if pretty:
+        try:
+            return orjson.dumps(orjson.loads(raw), option=orjson.OPT_INDENT_2).decode('utf-8')
+        except orjson.JSONDecodeError:
+            pass  # Not valid JSON, log as-is
+    return raw.decode('utf-8', errors='replace')
+
 
 class GonkaClient:
     """Client for making signed requests to Gonka API"""
@@ -20,64 +42,106 @@ class GonkaClient:
         address: str,
         endpoint: str,
         provider_address: str,
-        timeout: float = 60.0
+        timeout: float = 60.0,
+        log_pretty_json: bool = False
     ):
         self.private_key = private_key
         self.address = address
         self.endpoint = endpoint.rstrip('/')
         self.provider_address = provider_address
         self.timeout = timeout
+        self.log_pretty_json = log_pretty_json
+        
+        # Parse private key once (remove 0x prefix if present)
+        pk = private_key[2:] if private_key.startswith('0x') else private_key
+        if coincurve:
+            self._sk = coincurve.PrivateKey(bytes.fromhex(pk))
+        else:
+            self._sk = SigningKey.from_string(bytes.fromhex(pk), curve=SECP256k1)
+            self._order = SECP256k1.order
+            self._half_order = SECP256k1.order // 2
+        self._provider_bytes = provider_address.encode('utf-8')
+        
+        # Headers that do not change between requests
+        self._base_headers = {
+            "Content-Type": "application/json",
+            "X-Requester-Address": address,
+        }
         
         # Initialize hybrid timestamp tracking
+        self._perf_counter_ns = time.perf_counter_ns
         self._wall_base = time.time_ns()
-        self._perf_base = time.perf_counter_ns()
+        self._perf_base = self._perf_counter_ns()
         
-        # HTTP client
-        self.client = httpx.AsyncClient(timeout=timeout)
+        # HTTP client (HTTP/2 multiplexes concurrent streams over pooled connections)
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=200,
+                max_keepalive_connections=100,
+                keepalive_expiry=30.0
+            )
+        )
     
     def _hybrid_timestamp_ns(self) -> int:
         """Generate hybrid timestamp (monotonic + aligned to wall clock)"""
-        return self._wall_base + (time.perf_counter_ns() - self._perf_base)
+        return self._wall_base + (self._perf_counter_ns() - self._perf_base)
     
     def _sign_payload(
         self,
         payload_bytes: bytes,
         timestamp_ns: int,
-        provider_address: str
+        provider_bytes: bytes
     ) -> str:
-        """Sign payload using ECDSA with SHA-256"""
-        # Remove 0x prefix if present
-        pk = self.private_key[2:] if self.private_key.startswith('0x') else self.private_key
-        sk = SigningKey.from_string(bytes.fromhex(pk), curve=SECP256k1)
+        """
+        Sign payload using ECDSA with SHA-256
         
+        Gonka providers verify the signature against the public key of
+        X-Requester-Address and there is no shared secret to negotiate, so
+        this cannot be replaced by a symmetric MAC. Every endpoint, including
+        GET /models, requires the signature.
+        """
         # Message bytes: payload || timestamp || provider_address
-        msg = payload_bytes + str(timestamp_ns).encode('utf-8') + provider_address.encode('utf-8')
+        msg = payload_bytes + b"%d" % timestamp_ns + provider_bytes
+        digest = hashlib.sha256(msg).digest()
+        
+        if coincurve:
+            # libsecp256k1 signs deterministically (RFC 6979) and always returns low-S;
+            # drop the trailing recovery id to get the compact r || s form
+            return base64.b64encode(self._sk.sign_recoverable(digest, hasher=None)[:64]).decode('utf-8')
         
         # Deterministic ECDSA over SHA-256 with low-S normalization
-        sig = sk.sign_deterministic(msg, hashfunc=hashlib.sha256)
+        sig = self._sk.sign_digest_deterministic(digest, hashfunc=hashlib.sha256)
         r, s = sig[:32], sig[32:]
         
-        order = SECP256k1.order
         s_int = int.from_bytes(s, 'big')
-        if s_int > order // 2:
-            s_int = order - s_int
+        if s_int > self._half_order:
+            s_int = self._order - s_int
             s = s_int.to_bytes(32, 'big')
         
         return base64.b64encode(r + s).decode('utf-8')
     
-    def _prepare_request(self, payload: Optional[dict]) -> Tuple[bytes, dict]:
+    async def _prepare_request(
+        self,
+        payload: Optional[dict],
+        payload_bytes: Optional[bytes] = None
+    ) -> Tuple[bytes, dict]:
         """Prepare request data (payload bytes, headers with signature)"""
-        if payload is None:
-            payload = {}
+        if payload_bytes is None:
+            payload_bytes = orjson.dumps(payload) if payload else _EMPTY_JSON
         
-        payload_bytes = json.dumps(payload).encode('utf-8')
         timestamp_ns = self._hybrid_timestamp_ns()
-        signature = self._sign_payload(payload_bytes, timestamp_ns, self.provider_address)
+        if len(payload_bytes) > _SIGN_IN_EXECUTOR_THRESHOLD:
+            signature = await asyncio.get_running_loop().run_in_executor(
+                None, self._sign_payload, payload_bytes, timestamp_ns, self._provider_bytes
+            )
+        else:
+            signature = self._sign_payload(payload_bytes, timestamp_ns, self._provider_bytes)
         
         headers = {
-            "Content-Type": "application/json",
+            **self._base_headers,
             "Authorization": signature,
-            "X-Requester-Address": self.address,
             "X-Timestamp": str(timestamp_ns),
         }
         
@@ -99,19 +163,22 @@ class GonkaClient:
         self,
         method: str,
         path: str,
-        payload: Optional[dict] = None
+        payload: Optional[dict] = None,
+        payload_bytes: Optional[bytes] = None
     ) -> dict:
-        """Make a signed request to Gonka API (non-streaming)"""
+        """
+        Make a signed request to Gonka API (non-streaming)
+        
+        If payload_bytes is given it is signed and sent as-is instead of
+        serializing payload.
+        """
         url = f"{self.endpoint}{path}"
-        payload_bytes, headers = self._prepare_request(payload)
+        payload_bytes, headers = await self._prepare_request(payload, payload_bytes)
         
         # Log request body before sending
-        try:
-            request_body = json.loads(payload_bytes.decode('utf-8'))
-            logger.info(f"Gonka API Request: {method} {url}")
-            logger.info(f"Request body: {json.dumps(request_body, indent=2, ensure_ascii=False)}")
-        except Exception as e:
-            logger.warning(f"Failed to log request body: {e}")
+        logger.info("Gonka API Request: %s %s", method, url)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request body: %s", format_body(payload_bytes, self.log_pretty_json))
         
         try:
             response = await self.client.request(
@@ -139,19 +206,24 @@ class GonkaClient:
         self,
         method: str,
         path: str,
-        payload: Optional[dict] = None
+        payload: Optional[dict] = None,
+        payload_bytes: Optional[bytes] = None
     ):
-        """Make a signed streaming request to Gonka API"""
+        """
+        Make a signed streaming request to Gonka API
+        
+        If payload_bytes is given it is signed and sent as-is instead of
+        serializing payload.
+        """
         url = f"{self.endpoint}{path}"
-        payload_bytes, headers = self._prepare_request(payload)
+        payload_bytes, headers = await self._prepare_request(payload, payload_bytes)
+        # Chunks are forwarded undecoded, so ask for an uncompressed body
+        headers["Accept-Encoding"] = "identity"
         
         # Log request body before sending
-        try:
-            request_body = json.loads(payload_bytes.decode('utf-8'))
-            logger.info(f"Gonka API Stream Request: {method} {url}")
-            logger.info(f"Request body: {json.dumps(request_body, indent=2, ensure_ascii=False)}")
-        except Exception as e:
-            logger.warning(f"Failed to log request body: {e}")
+        logger.info("Gonka API Stream Request: %s %s", method, url)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request body: %s", format_body(payload_bytes, self.log_pretty_json))
         
         try:
             async with self.client.stream(
@@ -171,7 +243,7 @@ class GonkaClient:
                         logger.error(f"Gonka API Stream Error Response: {response.status_code} (failed to read body: {read_err})")
                     response.raise_for_status()
                 
-                async for chunk in response.aiter_bytes():
+                async for chunk in response.aiter_raw():
                     yield chunk
         except httpx.HTTPStatusError as e:
             # Log error response (fallback for non-stream errors)
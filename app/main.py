@@ -1,105 +1,129 @@
+import hashlib
 import json
 import logging
 from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Optional, List, Dict
+import orjson
 from fastapi import FastAPI, Request, HTTPException, Depends
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.responses import Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic_settings import BaseSettings
 
-from app.gonka_client import GonkaClient
+from app.config import settings
+from app.gonka_client import GonkaClient, format_body
 from app.auth import verify_api_key
 
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=settings.log_level.upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 logger = logging.getLogger(__name__)
 
 
-class Settings(BaseSettings):
-    """Application settings"""
-    # Gonka API settings
-    gonka_private_key: str = ""
-    gonka_address: str = ""
-    gonka_endpoint: str = ""
-    gonka_provider_address: str = ""
+# Models cache
+available_models: List[Dict] = []
+v1_models_body: bytes = b""
+api_models_body: bytes = b""
+
+# Static health check body
+HEALTH_BODY = b'{"status":"ok"}'
+
+# Web interface page, loaded once
+INDEX_HTML = Path("app/static/index.html").read_bytes()
+INDEX_ETAG = f'"{hashlib.sha256(INDEX_HTML).hexdigest()[:16]}"'
+
+
+def _cache_models(models: List[Dict]):
+    """Store loaded models and pre-serialize the (static) models endpoint responses"""
+    global available_models, v1_models_body, api_models_body
+    available_models = models
     
-    # API Key for external access
-    api_key: str = ""
+    # Convert Gonka models format to OpenAI format
+    models_data = [
+        {
+            "id": model.get("id", "unknown"),
+            "object": "model",
+            "created": 1677610602,  # Default timestamp
+            "owned_by": "gonka"
+        }
+        for model in models
+    ]
     
-    # Server settings
-    host: str = "0.0.0.0"
-    port: int = 8000
+    # If no models loaded, return default
+    if not models_data:
+        models_data = [{
+            "id": "gonka-model",
+            "object": "model",
+            "created": 1677610602,
+            "owned_by": "gonka"
+        }]
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
-
+    # Serialized once at startup; stdlib json (unlike orjson) handles integers beyond 64 bits
+    v1_models_body = json.dumps({
+        "object": "list",
+        "data": models_data
+    }, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+    api_models_body = json.dumps({
+        "models": models
+    }, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
 
-settings = Settings()
 
-
-# Initialize Gonka client and models cache
-gonka_client: Optional[GonkaClient] = None
-available_models: List[Dict] = []
+_cache_models([])
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events"""
     # Startup
-    global gonka_client, available_models
-    
-    # Initialize client and load models
+    # Create the client once and load models before accepting traffic
+    app.state.gonka_client = None
     try:
         # Check if configuration is complete before loading models
         client = _create_gonka_client()
+        app.state.gonka_client = client
         if client:
             models = await client.get_models()
-            available_models = models
-            logger.info(f"Successfully loaded {len(available_models)} models at startup")
+            _cache_models(models)
+            logger.info(f"Successfully loaded {len(models)} models at startup")
         else:
             logger.warning("Gonka configuration incomplete, skipping model loading")
-            available_models = []
+            _cache_models([])
     except Exception as e:
         logger.error(f"Failed to load models at startup: {e}")
-        available_models = []
+        _cache_models([])
     
     yield
     
     # Shutdown
-    if gonka_client:
-        await gonka_client.close()
+    if app.state.gonka_client:
+        await app.state.gonka_client.close()
 
 
 def _create_gonka_client() -> Optional[GonkaClient]:
     """Create Gonka client if configuration is complete (returns None if not configured)"""
-    global gonka_client
-    if gonka_client is None:
-        if not all([
-            settings.gonka_private_key,
-            settings.gonka_address,
-            settings.gonka_endpoint,
-            settings.gonka_provider_address
-        ]):
-            return None
-        gonka_client = GonkaClient(
-            private_key=settings.gonka_private_key,
-            address=settings.gonka_address,
-            endpoint=settings.gonka_endpoint,
-            provider_address=settings.gonka_provider_address
-        )
-    return gonka_client
+    if not all([
+        settings.gonka_private_key,
+        settings.gonka_address,
+        settings.gonka_endpoint,
+        settings.gonka_provider_address
+    ]):
+        return None
+    return GonkaClient(
+        private_key=settings.gonka_private_key,
+        address=settings.gonka_address,
+        endpoint=settings.gonka_endpoint,
+        provider_address=settings.gonka_provider_address,
+        log_pretty_json=settings.log_pretty_json
+    )
 
 
-def get_gonka_client() -> GonkaClient:
-    """Get or create Gonka client (raises HTTPException if not configured)"""
-    client = _create_gonka_client()
+def get_gonka_client(request: Request) -> GonkaClient:
+    """Get the Gonka client created at startup (raises HTTPException if not configured)"""
+    client = getattr(request.app.state, "gonka_client", None)
     if client is None:
         missing = []
         if not settings.gonka_private_key:
@@ -111,6 +135,12 @@ def get_gonka_client() -> GonkaClient:
         if not settings.gonka_provider_address:
             missing.append("GONKA_PROVIDER_ADDRESS (provider address in bech32 format, get it from the Gonka provider)")
         
+        if not missing:
+            raise HTTPException(
+                status_code=500,
+                detail="Gonka client failed to initialize at startup, check server logs"
+            )
+        
         raise HTTPException(
             status_code=500,
             detail=f"Gonka configuration incomplete. Missing: {', '.join(missing)}. "
@@ -141,42 +171,13 @@ app.add_middleware(
 @app.get("/v1/models")
 async def list_models(request: Request, api_key_valid: bool = Depends(verify_api_key)):
     """List available models (OpenAI-compatible endpoint)"""
-    global available_models
-    
-    # Convert Gonka models format to OpenAI format
-    models_data = []
-    for model in available_models:
-        model_id = model.get("id", "unknown")
-        models_data.append({
-            "id": model_id,
-            "object": "model",
-            "created": 1677610602,  # Default timestamp
-            "owned_by": "gonka"
-        })
-    
-    # If no models loaded, return default
-    if not models_data:
-        models_data = [{
-            "id": "gonka-model",
-            "object": "model",
-            "created": 1677610602,
-            "owned_by": "gonka"
-        }]
-    
-    return {
-        "object": "list",
-        "data": models_data
-    }
+    return Response(content=v1_models_body, media_type="application/json")
 
 # Models endpoint without auth (for web interface)
 @app.get("/api/models")
 async def get_models_no_auth():
     """Get available models without authentication (for web interface)"""
-    global available_models
-    
-    return {
-        "models": available_models
-    }
+    return Response(content=api_models_body, media_type="application/json")
 
 
 # Chat completions endpoint
@@ -186,13 +187,15 @@ async def chat_completions(
     api_key_valid: bool = Depends(verify_api_key)
 ):
     """Chat completions endpoint (OpenAI-compatible)"""
-    client = get_gonka_client()
+    client = get_gonka_client(request)
     
     try:
-        body = await request.json()
+        raw_body = await request.body()
+        body = orjson.loads(raw_body)
         # Log incoming request body
         logger.info("Incoming chat completions request")
-        logger.info(f"Request body: {json.dumps(body, indent=2, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request body: %s", format_body(raw_body, settings.log_pretty_json))
     except Exception as e:
         logger.error(f"Failed to parse request JSON: {e}")
         raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
@@ -201,22 +204,14 @@ async def chat_completions(
     
     try:
         if stream:
-            # Streaming response - proxy SSE from Gonka
-            async def generate():
-                try:
-                    async for chunk in client.request_stream(
-                        method="POST",
-                        path="/chat/completions",
-                        payload=body
-                    ):
-                        # Yield chunk as-is (Gonka should return SSE format)
-                        yield chunk
-                except Exception as e:
-                    logger.error(f"Streaming error: {type(e).__name__}: {str(e)}")
-                    raise
-            
+            # Streaming response - proxy SSE from Gonka as-is
+            # (request_stream logs its own errors)
             return StreamingResponse(
-                generate(),
+                client.request_stream(
+                    method="POST",
+                    path="/chat/completions",
+                    payload_bytes=raw_body
+                ),
                 media_type="text/event-stream",
                 headers={
                     "Cache-Control": "no-cache",
@@ -229,7 +224,7 @@ async def chat_completions(
             response = await client.request(
                 method="POST",
                 path="/chat/completions",
-                payload=body
+                payload_bytes=raw_body
             )
             return response
     except Exception as e:
@@ -242,26 +237,34 @@ async def chat_completions(
 
 # Web interface endpoint (must be before static mount)
 @app.get("/")
-async def web_interface():
+async def web_interface(request: Request):
     """Serve web chat interface"""
-    return FileResponse("app/static/index.html")
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and INDEX_ETAG in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": INDEX_ETAG})
+    return Response(content=INDEX_HTML, media_type="text/html", headers={"ETag": INDEX_ETAG})
 
 # Health check endpoint (no auth required)
 @app.get("/health")
 async def health():
     """Health check endpoint"""
-    return {"status": "ok"}
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
 # Serve static files (must be last)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
+        # uvloop is not available on Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=settings.workers,
         reload=False
     )
 